@@ -63,7 +63,12 @@ class Screen:
             Nested list of SCX, SCY, WX and WY for each scanline (144x4). Returns (0, 0, 0, 0) when LCD is off.
         """
         if self.mb.lcd._LCDC.lcd_enable:
-            return [[line[0], line[1], line[2], line[3]] for line in self.mb.lcd.renderer._scanlineparameters]
+            return [[
+                self.mb.lcd.renderer._scanline_bx[y],
+                self.mb.lcd.renderer._scanline_by[y],
+                self.mb.lcd.renderer._scanline_wx[y],
+                self.mb.lcd.renderer._scanline_wy[y],
+            ] for y in range(ROWS)]
         else:
             return [[0, 0, 0, 0] for line in range(144)]
 
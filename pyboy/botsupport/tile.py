@@ -10,7 +10,6 @@ The Game Boy uses tiles as the building block for all graphics on the screen. Th
 import logging
 
 import numpy as np
-from pyboy.utils import color_code
 
 from .constants import LOW_TILEDATA, VRAM_OFFSET
 
@@ -119,19 +118,19 @@ class Tile:
         memoryview :
             Image data of tile in 8x8 pixels and RGBA colors.
         """
-        data = np.zeros((8, 8), dtype=np.uint32)
+        # Resolve the background palette to the final colors once, instead of for every pixel.
         # Converting from RGBA to ABGR
-        color_palette = [(x >> 8) | 0xFF000000 for x in self.mb.lcd.renderer.color_palette]
+        color_palette = self.mb.lcd.renderer.color_palette
+        palette_lut = [(color_palette[self.mb.lcd.BGP.getcolor(c)] >> 8) | 0xFF000000 for c in range(4)]
 
-        for k in range(0, 16, 2): # 2 bytes for each line
-            byte1 = self.mb.lcd.VRAM[self.data_address + k - VRAM_OFFSET]
-            byte2 = self.mb.lcd.VRAM[self.data_address + k + 1 - VRAM_OFFSET]
+        # Decode all 64 pixels at once. Each line is 2 bytes: The first byte holds the low bit of the color codes,
+        # and the second byte holds the high bit. The leftmost pixel is in the most significant bit.
+        start = self.data_address - VRAM_OFFSET
+        tiledata = np.fromiter(self.mb.lcd.VRAM[start:start + 16], dtype=np.uint8, count=16)
+        bits = np.arange(7, -1, -1, dtype=np.uint8)
+        colorcodes = ((tiledata[0::2, None] >> bits) & 1) | (((tiledata[1::2, None] >> bits) & 1) << 1)
 
-            for x in range(8):
-                colorcode = color_code(byte1, byte2, 7 - x)
-                data[k // 2][x] = color_palette[self.mb.lcd.BGP.getcolor(colorcode)]
-
-        return data
+        return np.array(palette_lut, dtype=np.uint32)[colorcodes]
 
     def __eq__(self, other):
         return self.data_address == other.data_address
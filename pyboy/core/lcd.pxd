@@ -9,11 +9,12 @@ import cython
 from cpython.array cimport array
 from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t, int16_t
 cimport pyboy.utils
-from pyboy.utils cimport color_code
 from pyboy.utils cimport IntIOInterface
 cdef uint8_t INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW
 cdef uint16_t LCDC, STAT, SCY, SCX, LY, LYC, DMA, BGP, OBP0, OBP1, WY, WX
 cdef int ROWS, COLS, TILES, FRAME_CYCLES, VIDEO_RAM, OBJECT_ATTRIBUTE_MEMORY
+cdef uint16_t[256] BIT_SPREAD
+cdef bytes ALL_TILES_CHANGED
 
 
 cdef class LCD:
@@ -46,7 +47,20 @@ cdef class LCD:
     cdef PaletteRegister OBP1
     cdef Renderer renderer
 
-    @cython.locals(interrupt_flag=uint8_t)
+    IF DEBUG:
+        cpdef uint8_t get_lcdc(self)
+        cpdef void set_lcdc(self, uint8_t)
+        cpdef uint8_t get_stat(self)
+        cpdef void set_stat(self, uint8_t)
+    ELSE:
+        cdef uint8_t get_lcdc(self)
+        cdef void set_lcdc(self, uint8_t)
+        cdef uint8_t get_stat(self)
+        cdef void set_stat(self, uint8_t)
+    @cython.locals(b=bint)
+    cdef bint processing_frame(self)
+
+    @cython.locals(interrupt_flag=uint8_t, mode=uint8_t)
     cdef uint8_t tick(self, int)
     cdef uint64_t cyclestointerrupt(self)
 
@@ -64,7 +78,6 @@ cdef class PaletteRegister:
     cdef uint32_t[4] lookup
     cdef uint32_t[4] color_palette
 
-    @cython.locals(x=uint16_t)
     cdef bint set(self, uint64_t)
     cdef uint32_t getcolor(self, uint8_t)
 
@@ -103,7 +116,8 @@ cdef class Renderer:
     cdef str color_format
     cdef tuple buffer_dims
     cdef bint clearcache
-    cdef set tiles_changed
+    cdef bytearray tiles_changed
+    cdef uint32_t[4] _bg_lut, _obp0_lut, _obp1_lut
     cdef bint disable_renderer
     cdef int old_stat_mode
 
@@ -112,14 +126,42 @@ cdef class Renderer:
     cdef uint32_t[:,:] _screenbuffer
     cdef uint32_t[:,:] _tilecache, _spritecache0, _spritecache1
 
-    cdef int[144][5] _scanlineparameters
+    cdef uint8_t[144] _scanline_bx
+    cdef uint8_t[144] _scanline_by
+    cdef int16_t[144] _scanline_wx
+    cdef uint8_t[144] _scanline_wy
+    cdef uint8_t[144] _scanline_tiledata_select
 
-    @cython.locals(bx=int, by=int, wx=int, wy=int)
+    @cython.locals(
+        bx=int,
+        by=int,
+        wx=int,
+        wy=int,
+        x=int,
+        background_offset=int,
+        wmap=int,
+        window_enable=bint,
+        background_enable=bint,
+        tile_flip=int,
+        tile_base=int,
+        background_row=int,
+        background_y=int,
+        window_row=int,
+        window_y=int,
+        window_start=int,
+        screenline=uint32_t[:],
+        tilerow=uint32_t[:],
+        prev_tile=int,
+        tile_x=int,
+        n=int,
+        wt=int,
+        bt=int,
+    )
     cdef void scanline(self, int, LCD)
 
-    cdef list sprites_to_render_n
-    cdef list sprites_to_render_x
     cdef int ly_window
+    cdef int[10] sprites_to_render
+    cdef uint8_t[144] sprites_on_ly
 
     @cython.locals(
         y=int,
@@ -133,7 +175,12 @@ cdef class Renderer:
         yflip=bint,
         spritepriority=bint,
         spritecache=uint32_t[:,:],
-        sprites_priority=list,
+        sprite_count=int,
+        key=int,
+        i=int,
+        screenline=uint32_t[:],
+        spriterow=uint32_t[:],
+        alphamask=uint32_t,
         dy=int,
         dx=int,
         yy=int,
@@ -162,17 +209,38 @@ cdef class Renderer:
     )
     cdef void render_sprites(self, LCD, uint32_t[:,:], bint)
 
+    @cython.locals(x=int, y=int, color=uint32_t, screenline=uint32_t[:])
+    cdef void blank_screen(self)
+
+    @cython.locals(colorcode=int)
+    cdef void update_palettes(self, LCD)
+
+    cdef void render_scanline(self, LCD, int)
+
+    cdef void invalidate_cache(self, LCD)
+
+    @cython.locals(t=int)
+    cdef void update_cache(self, LCD)
+
     @cython.locals(
         x=int,
-        t=int,
         k=int,
         y=int,
+        base=int,
         byte1=uint8_t,
         byte2=uint8_t,
+        colorcodes=uint16_t,
         colorcode=uint32_t,
-        alpha=uint32_t
+        bg_lut=uint32_t[4],
+        obp0_lut=uint32_t[4],
+        obp1_lut=uint32_t[4],
+        tilerow=uint32_t[:],
+        spriterow0=uint32_t[:],
+        spriterow1=uint32_t[:],
         )
-    cdef void update_cache(self, LCD)
+    cdef void update_tile(self, LCD, int)
 
+    @cython.locals(y=int)
     cdef void save_state(self, IntIOInterface)
+    @cython.locals(y=int)
     cdef void load_state(self, IntIOInterface, int)
@@ -8,8 +8,6 @@ from array import array
 from ctypes import c_void_p
 from random import getrandbits
 
-from pyboy.utils import color_code
-
 logger = logging.getLogger(__name__)
 
 VIDEO_RAM = 8 * 1024 # 8KB
@@ -18,6 +16,11 @@ OBJECT_ATTRIBUTE_MEMORY = 0xA0
 INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW = [1 << x for x in range(5)]
 ROWS, COLS = 144, 160
 TILES = 384
+ALL_TILES_CHANGED = b"\x01" * TILES # Copied into `tiles_changed` in one go, when the whole cache is invalidated
+
+# The 8 bits of a byte of tile data spread out to every other bit, with the leftmost pixel (bit 7) in the lowest bits.
+# This decodes all 8 color codes of a tile row at once: BIT_SPREAD[byte1] | (BIT_SPREAD[byte2] << 1)
+BIT_SPREAD = [sum(((b >> (7 - x)) & 1) << (x * 2) for x in range(8)) for b in range(256)]
 
 FRAME_CYCLES = 70224
 
@@ -56,6 +59,7 @@ class LCD:
         self.clock_target = 0
         self.frame_done = False
         self.renderer = Renderer(disable_renderer, color_palette)
+        self.renderer.update_palettes(self)
         self.max_ly = 153
         if patch_supermarioland:
             self.max_ly = 155 # Avoid jittering of top scanline. Possibly a fault in the game ROM.
@@ -106,8 +110,9 @@ class LCD:
                     self.clock %= FRAME_CYCLES
                     self.clock_target %= FRAME_CYCLES
 
-                # Change to next mode
-                interrupt_flag |= self._STAT.set_mode(self.next_stat_mode)
+                # Change to next mode. The mode is kept in a local, as it's checked up to four times below.
+                mode = self.next_stat_mode
+                interrupt_flag |= self._STAT.set_mode(mode)
 
                 # Pan Docs:
                 # The following are typical when the display is enabled:
@@ -117,24 +122,22 @@ class LCD:
                 #   Mode 1  ____________________________________11111111111111_____
 
                 # LCD state machine
-                if self._STAT._mode == 2: # Searching OAM
+                if mode == 2: # Searching OAM
                     self.clock_target += 80
                     self.next_stat_mode = 3
                     self.LY += 1
                     interrupt_flag |= self._STAT.update_LYC(self.LYC, self.LY)
-                elif self._STAT._mode == 3:
+                elif mode == 3:
                     self.clock_target += 170
                     self.next_stat_mode = 0
-                elif self._STAT._mode == 0: # HBLANK
+                elif mode == 0: # HBLANK
                     self.clock_target += 206
                     if self.LY <= 143:
-                        self.renderer.update_cache(self)
-                        self.renderer.scanline(self.LY, self)
-                        self.renderer.scanline_sprites(self, self.LY, self.renderer._screenbuffer, False)
+                        self.renderer.render_scanline(self, self.LY)
                         self.next_stat_mode = 2
                     else:
                         self.next_stat_mode = 1
-                elif self._STAT._mode == 1: # VBLANK
+                elif mode == 1: # VBLANK
                     self.clock_target += 456
                     self.next_stat_mode = 1
 
@@ -157,11 +160,10 @@ class LCD:
         return interrupt_flag
 
     def save_state(self, f):
-        for n in range(VIDEO_RAM):
-            f.write(self.VRAM[n])
-
-        for n in range(OBJECT_ATTRIBUTE_MEMORY):
-            f.write(self.OAM[n])
+        # The explicit lengths are needed, as VRAM and OAM are C arrays in Cython. A plain `bytes(...)` would be read as
+        # a zero-terminated string.
+        f.write_bytes(bytes(self.VRAM[:VIDEO_RAM]))
+        f.write_bytes(bytes(self.OAM[:OBJECT_ATTRIBUTE_MEMORY]))
 
         f.write(self._LCDC.value)
         f.write(self.BGP.value)
@@ -178,11 +180,8 @@ class LCD:
         f.write(self.WX)
 
     def load_state(self, f, state_version):
-        for n in range(VIDEO_RAM):
-            self.VRAM[n] = f.read()
-
-        for n in range(OBJECT_ATTRIBUTE_MEMORY):
-            self.OAM[n] = f.read()
+        self.VRAM = array("B", f.read_bytes(VIDEO_RAM))
+        self.OAM = array("B", f.read_bytes(OBJECT_ATTRIBUTE_MEMORY))
 
         self.set_lcdc(f.read())
         self.BGP.set(f.read())
@@ -209,7 +208,7 @@ class LCD:
 class PaletteRegister:
     def __init__(self, value):
         self.value = 0
-        self.lookup = [0] * 4
+        self.lookup = array("B", [0] * 4)
         self.set(value)
 
     def set(self, value):
@@ -218,8 +217,10 @@ class PaletteRegister:
             return False
 
         self.value = value
-        for x in range(4):
-            self.lookup[x] = (value >> x * 2) & 0b11
+        self.lookup[0] = value & 0b11
+        self.lookup[1] = (value >> 2) & 0b11
+        self.lookup[2] = (value >> 4) & 0b11
+        self.lookup[3] = (value >> 6) & 0b11
         return True
 
     def getcolor(self, i):
@@ -297,14 +298,21 @@ class Renderer:
         self.buffer_dims = (160, 144)
 
         self.clearcache = False
-        self.tiles_changed = set([])
+        # One byte per tile, which is set when the tile data has changed in VRAM. All tiles start out as changed, as the
+        # caches don't reflect the initial VRAM yet, and writes of unchanged data don't mark the tile.
+        self.tiles_changed = bytearray(ALL_TILES_CHANGED)
         self.disable_renderer = disable_renderer
 
-        # Init buffers as white
-        self._screenbuffer_raw = array("B", [0xFF] * (ROWS*COLS*4))
-        self._tilecache_raw = array("B", [0xFF] * (TILES*8*8*4))
-        self._spritecache0_raw = array("B", [0xFF] * (TILES*8*8*4))
-        self._spritecache1_raw = array("B", [0xFF] * (TILES*8*8*4))
+        # The final colors of the four color codes of each palette. Rebuilt when a palette register changes.
+        self._bg_lut = array("I", [0] * 4)
+        self._obp0_lut = array("I", [0] * 4)
+        self._obp1_lut = array("I", [0] * 4)
+
+        # Init buffers as white. Initializing from bytes avoids building a temporary list of Python ints.
+        self._screenbuffer_raw = array("B", b"\xFF" * (ROWS*COLS*4))
+        self._tilecache_raw = array("B", b"\xFF" * (TILES*8*8*4))
+        self._spritecache0_raw = array("B", b"\xFF" * (TILES*8*8*4))
+        self._spritecache1_raw = array("B", b"\xFF" * (TILES*8*8*4))
 
         if cythonmode:
             self._screenbuffer = memoryview(self._screenbuffer_raw).cast("I", shape=(ROWS, COLS))
@@ -322,60 +330,100 @@ class Renderer:
             self._spritecache1 = [v[i:i + 8] for i in range(0, TILES * 8 * 8, 8)]
             self._screenbuffer_ptr = c_void_p(self._screenbuffer_raw.buffer_info()[0])
 
-        self._scanlineparameters = [[0, 0, 0, 0, 0] for _ in range(ROWS)]
+        # The registers used for each scanline are stored as one array per register. WX - 7 can be negative, so it
+        # needs a signed type.
+        self._scanline_bx = array("B", [0] * ROWS)
+        self._scanline_by = array("B", [0] * ROWS)
+        self._scanline_wx = array("h", [0] * ROWS)
+        self._scanline_wy = array("B", [0] * ROWS)
+        self._scanline_tiledata_select = array("B", [0] * ROWS)
         self.ly_window = 0
+        # Sorted priority keys of the sprites on the current scanline. Only the first `sprite_count` are valid.
+        self.sprites_to_render = array("i", [0] * 10)
+        # Number of sprites drawn on each scanline by render_sprites
+        self.sprites_on_ly = array("B", [0] * ROWS)
 
     def scanline(self, y, lcd):
         bx, by = lcd.getviewport()
         wx, wy = lcd.getwindowpos()
-        self._scanlineparameters[y][0] = bx
-        self._scanlineparameters[y][1] = by
-        self._scanlineparameters[y][2] = wx
-        self._scanlineparameters[y][3] = wy
-        self._scanlineparameters[y][4] = lcd._LCDC.tiledata_select
+        self._scanline_bx[y], self._scanline_by[y], self._scanline_wx[y], self._scanline_wy[y] = bx, by, wx, wy
+        self._scanline_tiledata_select[y] = lcd._LCDC.tiledata_select
 
         # All VRAM addresses are offset by 0x8000
         # Following addresses are 0x9800 and 0x9C00
         background_offset = 0x1800 if lcd._LCDC.backgroundmap_select == 0 else 0x1C00
         wmap = 0x1800 if lcd._LCDC.windowmap_select == 0 else 0x1C00
 
-        # Used for the half tile at the left side when scrolling
-        offset = bx & 0b111
-
         # Weird behavior, where the window has it's own internal line counter. It's only incremented whenever the
         # window is drawing something on the screen.
-        if lcd._LCDC.window_enable and wy <= y and wx < COLS:
+        window_enable = lcd._LCDC.window_enable and wy <= y
+        if window_enable and wx < COLS:
             self.ly_window += 1
 
-        for x in range(COLS):
-            if lcd._LCDC.window_enable and wy <= y and wx <= x:
-                wt = lcd.VRAM[wmap + (self.ly_window) // 8 * 32 % 0x400 + (x-wx) // 8 % 32]
-                # If using signed tile indices, modify index
-                if not lcd._LCDC.tiledata_select:
-                    # (x ^ 0x80 - 128) to convert to signed, then
-                    # add 256 for offset (reduces to + 128)
-                    wt = (wt ^ 0x80) + 128
-                self._screenbuffer[y][x] = self._tilecache[8*wt + (self.ly_window) % 8][(x-wx) % 8]
-            elif lcd._LCDC.background_enable:
-                bt = lcd.VRAM[background_offset + (y+by) // 8 * 32 % 0x400 + (x+bx) // 8 % 32]
-                # If using signed tile indices, modify index
-                if not lcd._LCDC.tiledata_select:
-                    # (x ^ 0x80 - 128) to convert to signed, then
-                    # add 256 for offset (reduces to + 128)
-                    bt = (bt ^ 0x80) + 128
-                self._screenbuffer[y][x] = self._tilecache[8*bt + (y+by) % 8][(x+offset) % 8]
-            else:
-                # If background is disabled, it becomes white
-                self._screenbuffer[y][x] = self.color_palette[0]
+        # Everything below is constant for the whole scanline, so it is looked up once instead of for every pixel
+        background_enable = lcd._LCDC.background_enable
+        # If using signed tile indices, the tiles 0-127 are found after the tiles 128-255. Flipping bit 7 and adding
+        # 128 maps 0-127 to 256-383 and leaves 128-255 in place, so neither addressing mode needs a branch per tile.
+        if lcd._LCDC.tiledata_select:
+            tile_flip, tile_base = 0, 0
+        else:
+            tile_flip, tile_base = 0x80, 128
+        background_row = background_offset + (((y + by) >> 3) & 0x1F) * 32
+        background_y = (y + by) & 7
+        window_row = wmap + ((self.ly_window >> 3) & 0x1F) * 32
+        window_y = self.ly_window & 7
+
+        # The window covers the rest of the scanline from its left edge
+        window_start = COLS
+        if window_enable and wx < COLS:
+            window_start = max(wx, 0)
+
+        # Pixels are copied a tile row at a time. Only the first and last tile of each span can be partial, as the
+        # spans don't have to align with the tile grid. The tile maps are 32x32 tiles, so all wrap-arounds are done
+        # with bit masks instead of modulo.
+        #
+        # Large areas of the tile maps usually repeat the same tile (sky, empty floors, borders), so the tile row is
+        # only looked up again, when the tile index changes.
+        screenline = self._screenbuffer[y]
+        x = 0
+        if background_enable:
+            prev_tile = -1
+            while x < window_start:
+                bt = lcd.VRAM[background_row + (((x + bx) >> 3) & 0x1F)]
+                if bt != prev_tile:
+                    prev_tile = bt
+                    bt = (bt ^ tile_flip) + tile_base
+                    if self.tiles_changed[bt]:
+                        self.update_tile(lcd, bt)
+                    tilerow = self._tilecache[8*bt + background_y]
+                tile_x = (x + bx) & 7
+                n = min(8 - tile_x, window_start - x)
+                screenline[x:x + n] = tilerow[tile_x:tile_x + n]
+                x += n
+        else:
+            # If background is disabled, it becomes white
+            while x < window_start:
+                screenline[x] = self.color_palette[0]
+                x += 1
+
+        prev_tile = -1
+        while x < COLS:
+            wt = lcd.VRAM[window_row + (((x - wx) >> 3) & 0x1F)]
+            if wt != prev_tile:
+                prev_tile = wt
+                wt = (wt ^ tile_flip) + tile_base
+                if self.tiles_changed[wt]:
+                    self.update_tile(lcd, wt)
+                tilerow = self._tilecache[8*wt + window_y]
+            tile_x = (x - wx) & 7
+            n = min(8 - tile_x, COLS - x)
+            screenline[x:x + n] = tilerow[tile_x:tile_x + n]
+            x += n
 
         if y == 143:
             # Reset at the end of a frame. We set it to -1, so it will be 0 after the first increment
             self.ly_window = -1
 
-    def key_priority(self, x):
-        # NOTE: Cython is being insufferable, and demands a non-lambda function
-        return (self.sprites_to_render_x[x], self.sprites_to_render_n[x])
-
     def scanline_sprites(self, lcd, ly, buffer, ignore_priority):
 
         if not lcd._LCDC.sprite_enable:
@@ -385,8 +433,6 @@ class Renderer:
         bgpkey = self.color_palette[lcd.BGP.getcolor(0)]
 
         sprite_count = 0
-        self.sprites_to_render_n = [0] * 10
-        self.sprites_to_render_x = [0] * 10
 
         # Find the first 10 sprites in OAM that appears on this scanline.
         # The lowest X-coordinate has priority, when overlapping
@@ -394,11 +440,19 @@ class Renderer:
         # Loop through OAM, find 10 first sprites for scanline. Order based on X-coordinate high-to-low. Render them.
         for n in range(0x00, 0xA0, 4):
             y = lcd.OAM[n] - 16 # Documentation states the y coordinate needs to be subtracted by 16
-            x = lcd.OAM[n + 1] - 8 # Documentation states the x coordinate needs to be subtracted by 8
 
             if y <= ly < y + spriteheight:
-                self.sprites_to_render_n[sprite_count] = n
-                self.sprites_to_render_x[sprite_count] = x # Used for sorting for priority
+                # The X-coordinate is used for sorting for priority, and the OAM offset as tie breaker. The offset is
+                # below 0x100, so both fit in one integer. The raw X-coordinate sorts the same as the screen position,
+                # so it is only read for the sprites on this scanline.
+                key = (lcd.OAM[n + 1] << 8) | n
+                # Insertion sort into the preallocated slots. OAM is scanned in order, so the sprites already found
+                # only have to move, if they have a higher X-coordinate.
+                i = sprite_count
+                while i > 0 and self.sprites_to_render[i - 1] > key:
+                    self.sprites_to_render[i] = self.sprites_to_render[i - 1]
+                    i -= 1
+                self.sprites_to_render[i] = key
                 sprite_count += 1
 
             if sprite_count == 10:
@@ -409,10 +463,11 @@ class Renderer:
         # Z-fighting.) In CGB mode, the first sprite in OAM ($FE00-$FE03) has the highest priority, and so on. In
         # Non-CGB mode, the smaller the X coordinate, the higher the priority. The tie breaker (same X coordinates) is
         # the same priority as in CGB mode.
-        sprites_priority = sorted(range(sprite_count), key=self.key_priority)
+        screenline = buffer[ly]
+        alphamask = self.alphamask
 
-        for _n in sprites_priority[::-1]:
-            n = self.sprites_to_render_n[_n]
+        for i in range(sprite_count - 1, -1, -1):
+            n = self.sprites_to_render[i] & 0xFF
             y = lcd.OAM[n] - 16 # Documentation states the y coordinate needs to be subtracted by 16
             x = lcd.OAM[n + 1] - 8 # Documentation states the x coordinate needs to be subtracted by 8
             tileindex = lcd.OAM[n + 2]
@@ -427,23 +482,25 @@ class Renderer:
             dy = ly - y
             yy = spriteheight - dy - 1 if yflip else dy
 
+            # The lower half of a 8x16 sprite is the following tile
+            if self.tiles_changed[tileindex + (yy >> 3)]:
+                self.update_tile(lcd, tileindex + (yy >> 3))
+            spriterow = spritecache[8*tileindex + yy]
             for dx in range(8):
                 xx = 7 - dx if xflip else dx
-                pixel = spritecache[8*tileindex + yy][xx]
+                pixel = spriterow[xx]
                 if 0 <= x < COLS:
+                    # A transparent pixel is never drawn, and a sprite behind the background only shows through
+                    # background color 0. The cheap alpha test comes first, so the buffer is only read when needed.
                     # TODO: Checking `buffer[y][x] == bgpkey` is a bit of a hack
-                    if (spritepriority and not buffer[ly][x] == bgpkey):
-                        # Add a fake alphachannel to the sprite for BG pixels. We can't just merge this
-                        # with the next 'if', as sprites can have an alpha channel in other ways
-                        pixel &= ~self.alphamask
-
-                    if pixel & self.alphamask:
-                        buffer[ly][x] = pixel
+                    if pixel & alphamask and (not spritepriority or screenline[x] == bgpkey):
+                        screenline[x] = pixel
                 x += 1
             x -= 8
 
     def render_sprites(self, lcd, buffer, ignore_priority):
         # NOTE: LEGACY FUNCTION FOR DEBUG WINDOW! Use scanline_sprites instead
+        self.update_cache(lcd)
 
         # Render sprites
         # - Doesn't restrict 10 sprites per scan line
@@ -451,7 +508,9 @@ class Renderer:
         spriteheight = 16 if lcd._LCDC.sprite_height else 8
         bgpkey = self.color_palette[lcd.BGP.getcolor(0)]
 
-        sprites_on_ly = [0] * 144
+        # The counters are kept between calls, so they only need to be cleared
+        for y in range(ROWS):
+            self.sprites_on_ly[y] = 0
 
         for n in range(0x00, 0xA0, 4):
             y = lcd.OAM[n] - 16 # Documentation states the y coordinate needs to be subtracted by 16
@@ -468,10 +527,10 @@ class Renderer:
 
                 # Take care of sprite priorty. No more than 10 sprites per scanline
                 if 0 <= y < 144:
-                    if sprites_on_ly[y] >= 10:
+                    if self.sprites_on_ly[y] >= 10:
                         continue
                     else:
-                        sprites_on_ly[y] += 1
+                        self.sprites_on_ly[y] += 1
 
                 if 0 <= y < ROWS:
                     for dx in range(8):
@@ -490,67 +549,99 @@ class Renderer:
                     x -= 8
                 y += 1
 
-    def update_cache(self, lcd):
+    def update_palettes(self, lcd):
+        # Resolve each palette to its four final colors, so the pixel loop in update_cache only needs a single lookup.
+        # Color 0 is transparent for sprites, so the alpha channel is cleared here instead of in the pixel loop.
+        for colorcode in range(4):
+            self._bg_lut[colorcode] = self.color_palette[lcd.BGP.getcolor(colorcode)]
+            self._obp0_lut[colorcode] = self.color_palette[lcd.OBP0.getcolor(colorcode)]
+            self._obp1_lut[colorcode] = self.color_palette[lcd.OBP1.getcolor(colorcode)]
+        self._obp0_lut[0] &= ~self.alphamask
+        self._obp1_lut[0] &= ~self.alphamask
+
+    def render_scanline(self, lcd, y):
+        # Changed tiles are not decoded up front. The scanline and sprite renderers decode each changed tile, when they
+        # first read from it. This way, tiles which aren't on the screen, are never decoded.
         if self.clearcache:
-            self.tiles_changed.clear()
-            for x in range(0x8000, 0x9800, 16):
-                self.tiles_changed.add(x)
-            self.clearcache = False
-
-        for t in self.tiles_changed:
-            for k in range(0, 16, 2): # 2 bytes for each line
-                byte1 = lcd.VRAM[t + k - 0x8000]
-                byte2 = lcd.VRAM[t + k + 1 - 0x8000]
-                y = (t+k-0x8000) // 2
-
-                for x in range(8):
-                    colorcode = color_code(byte1, byte2, 7 - x)
-
-                    self._tilecache[y][x] = self.color_palette[lcd.BGP.getcolor(colorcode)]
-                    self._spritecache0[y][x] = self.color_palette[lcd.OBP0.getcolor(colorcode)]
-                    self._spritecache1[y][x] = self.color_palette[lcd.OBP1.getcolor(colorcode)]
-
-                    if colorcode == 0:
-                        self._spritecache0[y][x] &= ~self.alphamask
-                        self._spritecache1[y][x] &= ~self.alphamask
+            self.invalidate_cache(lcd)
+        self.scanline(y, lcd)
+        self.scanline_sprites(lcd, y, self._screenbuffer, False)
+
+    def invalidate_cache(self, lcd):
+        # A palette has changed (or a state was loaded), so every tile has to be redrawn with the new colors
+        self.update_palettes(lcd)
+        self.tiles_changed[:] = ALL_TILES_CHANGED
+        self.clearcache = False
 
-        self.tiles_changed.clear()
+    def update_cache(self, lcd):
+        # Decodes all changed tiles at once. Used when the caches are read outside of the scanline rendering.
+        if self.clearcache:
+            self.invalidate_cache(lcd)
+
+        t = self.tiles_changed.find(1)
+        while t != -1:
+            self.update_tile(lcd, t)
+            t = self.tiles_changed.find(1, t + 1)
+
+    def update_tile(self, lcd, t):
+        self.tiles_changed[t] = 0
+        bg_lut = self._bg_lut
+        obp0_lut = self._obp0_lut
+        obp1_lut = self._obp1_lut
+        base = t * 16 # 16 bytes of tile data per tile. The caches have a row for each 2 bytes.
+        for k in range(0, 16, 2): # 2 bytes for each line
+            byte1 = lcd.VRAM[base + k]
+            byte2 = lcd.VRAM[base + k + 1]
+            y = (base + k) >> 1
+
+            # The color codes of the row, two bits each, starting with the leftmost pixel
+            colorcodes = BIT_SPREAD[byte1] | (BIT_SPREAD[byte2] << 1)
+            tilerow = self._tilecache[y]
+            spriterow0 = self._spritecache0[y]
+            spriterow1 = self._spritecache1[y]
+            for x in range(8):
+                colorcode = colorcodes & 0b11
+                colorcodes >>= 2
+
+                tilerow[x] = bg_lut[colorcode]
+                spriterow0[x] = obp0_lut[colorcode]
+                spriterow1[x] = obp1_lut[colorcode]
 
     def blank_screen(self):
         # If the screen is off, fill it with a color.
+        # Only the first line is filled pixel by pixel. The rest of the lines are copied from it.
         color = self.color_palette[0]
-        for y in range(ROWS):
-            for x in range(COLS):
-                self._screenbuffer[y][x] = color
+        screenline = self._screenbuffer[0]
+        for x in range(COLS):
+            screenline[x] = color
+        for y in range(1, ROWS):
+            self._screenbuffer[y][:] = screenline
 
     def save_state(self, f):
         for y in range(ROWS):
-            f.write(self._scanlineparameters[y][0])
-            f.write(self._scanlineparameters[y][1])
+            f.write(self._scanline_bx[y])
+            f.write(self._scanline_by[y])
             # We store (WX - 7). We add 7 and mask 8 bits to make it easier to serialize
-            f.write((self._scanlineparameters[y][2] + 7) & 0xFF)
-            f.write(self._scanlineparameters[y][3])
-            f.write(self._scanlineparameters[y][4])
+            f.write((self._scanline_wx[y] + 7) & 0xFF)
+            f.write(self._scanline_wy[y])
+            f.write(self._scanline_tiledata_select[y])
 
-        for y in range(ROWS):
-            for x in range(COLS):
-                z = self._screenbuffer[y][x]
-                f.write_32bit(z)
+        # The raw buffer holds the 32-bit pixels in little-endian order, just like `write_32bit`
+        f.write_bytes(self._screenbuffer_raw.tobytes())
 
     def load_state(self, f, state_version):
         if state_version >= 2:
             for y in range(ROWS):
-                self._scanlineparameters[y][0] = f.read()
-                self._scanlineparameters[y][1] = f.read()
+                self._scanline_bx[y] = f.read()
+                self._scanline_by[y] = f.read()
                 # Restore (WX - 7) as described above
-                self._scanlineparameters[y][2] = (f.read() - 7) & 0xFF
-                self._scanlineparameters[y][3] = f.read()
+                self._scanline_wx[y] = (f.read() - 7) & 0xFF
+                self._scanline_wy[y] = f.read()
                 if state_version > 3:
-                    self._scanlineparameters[y][4] = f.read()
+                    self._scanline_tiledata_select[y] = f.read()
 
         if state_version >= 6:
-            for y in range(ROWS):
-                for x in range(COLS):
-                    self._screenbuffer[y][x] = f.read_32bit()
+            # Copied in place, as the screen buffer views and pointer refer to this array
+            self._screenbuffer_raw[:] = array("B", f.read_bytes(ROWS * COLS * 4))
 
         self.clearcache = True
@@ -274,10 +274,11 @@ class Motherboard:
             # Doesn't change the data. This is for MBC commands
             self.cartridge.setitem(i, value)
         elif 0x8000 <= i < 0xA000: # 8kB Video RAM
+            # Is within tile data -- not tile maps. Many games rewrite the same tile data, so the tile, which the byte
+            # belongs to, is only marked when the data actually changes.
+            if i < 0x9800 and self.lcd.VRAM[i - 0x8000] != value:
+                self.lcd.renderer.tiles_changed[(i - 0x8000) >> 4] = 1
             self.lcd.VRAM[i - 0x8000] = value
-            if i < 0x9800: # Is within tile data -- not tile maps
-                # Mask out the byte of the tile
-                self.lcd.renderer.tiles_changed.add(i & 0xFFF0)
         elif 0xA000 <= i < 0xC000: # 8kB switchable RAM bank
             self.cartridge.setitem(i, value)
         elif 0xC000 <= i < 0xE000: # 8kB Internal RAM
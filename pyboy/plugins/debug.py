@@ -211,6 +211,8 @@ class Debug(PyBoyWindowPlugin):
                 logger.info(f"Added breakpoint for address or label: {b}")
 
     def post_tick(self):
+        # The tile caches are only decoded on demand while rendering. Bring them up to date for the tile views.
+        self.mb.lcd.renderer.update_cache(self.mb.lcd)
         self.tile1.post_tick()
         self.tile2.post_tick()
         self.tiledata.post_tick()
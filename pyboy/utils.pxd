@@ -19,6 +19,8 @@ cdef class IntIOInterface:
     cdef void flush(self)
     cdef int read_16bit(self)
     cdef int read_32bit(self)
+    cdef int64_t write_bytes(self, bytes)
+    cdef bytes read_bytes(self, int64_t)
 
 
 cdef class IntIOWrapper(IntIOInterface):
@@ -38,6 +38,18 @@ class IntIOInterface:
         b = self.read()
         return int(a | (b << 8))
 
+    def write_bytes(self, data):
+        # Generic fallback. Implementations with an underlying file should write all the bytes in one call.
+        for byte in data:
+            self.write(byte)
+        return len(data)
+
+    def read_bytes(self, count):
+        data = bytearray(count)
+        for n in range(count):
+            data[n] = self.read()
+        return bytes(data)
+
     def read(self):
         raise Exception("Not implemented!")
 
@@ -76,6 +88,14 @@ class IntIOWrapper(IntIOInterface):
         assert len(data) == 1, "No data"
         return ord(data)
 
+    def write_bytes(self, data):
+        return self.buffer.write(data)
+
+    def read_bytes(self, count):
+        data = self.buffer.read(count)
+        assert len(data) == count, "No data"
+        return data
+
     def seek(self, pos):
         self.buffer.seek(pos)
 
@@ -87,10 +107,8 @@ class IntIOWrapper(IntIOInterface):
 # Misc
 
 
-# TODO: Would a lookup-table increase performance? For example a lookup table of each 4-bit nibble?
-# That's 16**2 = 256 values. Index calculated as: (byte1 & 0xF0) | ((byte2 & 0xF0) >> 4)
-# and then: (byte1 & 0x0F) | ((byte2 & 0x0F) >> 4)
-# Then could even be preloaded for each color palette
+# NOTE: For decoding a whole row of a tile, the renderer spreads both bytes with a lookup table, which yields all 8
+# color codes in a single integer. See `BIT_SPREAD` in `pyboy.core.lcd`.
 def color_code(byte1, byte2, offset):
     """Convert 2 bytes into color code at a given offset.
 
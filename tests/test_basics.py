@@ -4,6 +4,7 @@
 #
 import base64
 import hashlib
+import io
 import os
 import platform
 
@@ -196,3 +197,31 @@ def test_randomize_ram():
     assert any([pyboy.get_memory_value(x) for x in range(0xFF4C, 0xFF80)]), "Non-IO internal RAM 1 not randomized"
     assert any([pyboy.get_memory_value(x) for x in range(0xFF80, 0xFFFF)]), "Internal RAM 1 not randomized"
     pyboy.stop(save=False)
+
+
+def test_state_vram_oam():
+    pyboy = PyBoy(default_rom, window_type="headless")
+    pyboy.set_emulation_speed(0)
+    pyboy.tick()
+    # Both zero and non-zero bytes, as VRAM and OAM have to be saved in full, regardless of their content
+    for n in range(0x2000):
+        pyboy.set_memory_value(0x8000 + n, (n * 7) & 0xFF if n % 3 else 0)
+    for n in range(0xA0):
+        pyboy.set_memory_value(0xFE00 + n, (n*13 + 1) & 0xFF)
+    pyboy.tick()
+
+    vram = [pyboy.get_memory_value(x) for x in range(0x8000, 0xA000)]
+    oam = [pyboy.get_memory_value(x) for x in range(0xFE00, 0xFEA0)]
+    screen = pyboy.botsupport_manager().screen().raw_screen_buffer()
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    pyboy.stop(save=False)
+
+    pyboy = PyBoy(default_rom, window_type="headless")
+    state.seek(0)
+    pyboy.load_state(state)
+    assert state.tell() == len(state.getvalue()), "The whole state should be read back"
+    assert [pyboy.get_memory_value(x) for x in range(0x8000, 0xA000)] == vram, "VRAM not restored"
+    assert [pyboy.get_memory_value(x) for x in range(0xFE00, 0xFEA0)] == oam, "OAM not restored"
+    assert pyboy.botsupport_manager().screen().raw_screen_buffer() == screen, "Screen buffer not restored"
+    pyboy.stop(save=False)
@@ -7,7 +7,10 @@ import os
 import platform
 
 import pytest
-from pyboy.core.lcd import LCD
+from pyboy import PyBoy
+from pyboy.core.lcd import LCD, TILES, cythonmode
+from pyboy.utils import color_code
+from tests.utils import default_rom
 
 is_pypy = platform.python_implementation() == "PyPy"
 
@@ -122,3 +125,76 @@ class TestLCD:
     #             self.clock_target = 1 << 16
     #             self.LY = 0
     #         return interrupt_flag
+
+
+@pytest.mark.skipif(cythonmode, reason="The renderer caches and flags are C attributes in the Cython build")
+class TestRenderer:
+    def test_render_scanline_decodes_used_tiles(self):
+        lcd = LCD(False, color_palette)
+        renderer = lcd.renderer
+        lcd.set_lcdc(0b1001_0001) # LCD and background on, unsigned tile data. No window and no sprites.
+        assert renderer.tiles_changed.count(1) == TILES # All tiles start out as changed
+
+        # The background map is all tile 0, except for the second tile on the first row
+        lcd.VRAM[0x1800 + 1] = 5
+        lcd.VRAM[5 * 16] = 0xFF # First line of tile 5 is color code 1
+        renderer.render_scanline(lcd, 0)
+
+        assert not renderer.tiles_changed[0]
+        assert not renderer.tiles_changed[5]
+        assert renderer.tiles_changed.count(1) == TILES - 2, "Only the tiles on the scanline should be decoded"
+        assert list(renderer._screenbuffer[0][8:16]) == [renderer._bg_lut[1]] * 8
+        assert list(renderer._screenbuffer[0][16:24]) == [renderer._bg_lut[0]] * 8
+
+    def test_update_cache_after_clearcache(self):
+        lcd = LCD(False, color_palette)
+        renderer = lcd.renderer
+        for n in range(TILES * 16):
+            lcd.VRAM[n] = (n*37 + (n >> 4)) & 0xFF
+        renderer.update_cache(lcd)
+
+        # Changing the palettes requires every tile to be decoded again
+        lcd.BGP.set(0b0001_1011)
+        lcd.OBP0.set(0b1110_0100)
+        lcd.OBP1.set(0b0010_0111)
+        renderer.clearcache = True
+        renderer.update_cache(lcd)
+
+        assert not renderer.clearcache
+        assert renderer.tiles_changed.find(1) == -1
+        alphamask = renderer.alphamask
+        for t in range(TILES):
+            for k in range(0, 16, 2):
+                byte1 = lcd.VRAM[t*16 + k]
+                byte2 = lcd.VRAM[t*16 + k + 1]
+                y = (t*16 + k) // 2
+                for x in range(8):
+                    colorcode = color_code(byte1, byte2, 7 - x)
+                    # Color 0 is transparent for sprites
+                    sprite_alpha = ~alphamask if colorcode == 0 else -1
+                    assert renderer._tilecache[y][x] == renderer.color_palette[lcd.BGP.getcolor(colorcode)]
+                    assert renderer._spritecache0[y][x] == \
+                        renderer.color_palette[lcd.OBP0.getcolor(colorcode)] & sprite_alpha
+                    assert renderer._spritecache1[y][x] == \
+                        renderer.color_palette[lcd.OBP1.getcolor(colorcode)] & sprite_alpha
+
+    def test_unchanged_vram_write(self):
+        pyboy = PyBoy(default_rom, window_type="headless")
+        mb = pyboy.mb
+        renderer = mb.lcd.renderer
+        renderer.update_cache(mb.lcd)
+        assert renderer.tiles_changed.find(1) == -1
+
+        # Writing the same value doesn't change the tile
+        mb.setitem(0x8010, mb.getitem(0x8010))
+        assert renderer.tiles_changed.find(1) == -1
+
+        # Writing a new value marks the tile, which the byte belongs to
+        mb.setitem(0x8010, mb.getitem(0x8010) ^ 0xFF)
+        assert renderer.tiles_changed.find(1) == 1
+        assert renderer.tiles_changed.count(1) == 1
+
+        # Tile maps are not tile data
+        mb.setitem(0x9800, mb.getitem(0x9800) ^ 0xFF)
+        assert renderer.tiles_changed.count(1) == 1
+        pyboy.stop(save=False)